@@ -3,6 +3,7 @@
 import os
 import asyncio
 import json
+import threading
 from dotenv import load_dotenv
 from typing import Annotated
 from agent_framework import ai_function, ChatMessage, Role, TextContent
@@ -21,6 +22,37 @@ def gemini_deep_research(
     return "true"
 
 
+async def ainput(prompt: str = "") -> str:
+    """Read a line from the console without blocking the event loop.
+
+    The read runs on a daemon thread rather than the default executor, so Ctrl+C at
+    the prompt exits straight away instead of waiting for the pending input() call.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(line, error):
+        if future.done():  # Cancelled while the user was typing
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line)
+
+    def read_line():
+        try:
+            line, error = input(prompt), None
+        except Exception as e:  # e.g. EOFError when stdin closes
+            line, error = None, e
+        try:
+            loop.call_soon_threadsafe(resolve, line, error)
+        except RuntimeError:  # Event loop already closed
+            pass
+
+    threading.Thread(target=read_line, daemon=True).start()
+    return await future
+
+
 async def main():
     async with (
         DefaultAzureCredential() as credential,
@@ -35,7 +67,7 @@ async def main():
         ) as agent,
     ):
         # Prompt user for company to research
-        company_input = input("What company would you like to research today? ").strip()
+        company_input = (await ainput("What company would you like to research today? ")).strip()
         if not company_input:
             print("No company entered. Exiting...")
             return
@@ -64,7 +96,9 @@ async def main():
                 print("="*60)
 
                 # Get natural language response from user
-                user_response = input("\nWould you like to perform deep research on this company?\n(If not, explain what you would like changed, or type 'quit' to exit)\n\nYour response: ").strip()
+                user_response = (await ainput(
+                    "\nWould you like to perform deep research on this company?\n(If not, explain what you would like changed, or type 'quit' to exit)\n\nYour response: ",
+                )).strip()
 
                 if not user_response or user_response.lower() == 'quit':
                     print("\nExiting research session...")
@@ -96,4 +130,9 @@ async def main():
             print(f"\nAgent: {result.text}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:  # uvloop is POSIX-only; fall back to the default asyncio loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -5,8 +5,17 @@
 This agent helps research companies using Gemini Deep Research integration.
 """
 
-from .agent import agent
-
 # This export is required for DevUI discovery
 __all__ = ["agent"]
-__all__ = ["agent"]
+
+
+def __getattr__(name: str):
+    # Build the agent (and its Azure client) only when DevUI first asks for it
+    if name == "agent":
+        from .agent import agent
+
+        # Importing the submodule binds the name `agent` to the module itself; rebind it
+        # to the ChatAgent so later lookups don't return the module
+        globals()["agent"] = agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,21 +2,33 @@
 # Use `az login` to authenticate with Azure CLI
 """Sales Research Agent for DevUI - Main agent definition."""
 
+import asyncio
 import os
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
+import aiofiles
 from agent_framework import ai_function, ChatAgent
 from agent_framework.azure import AzureAIAgentClient
 from azure.identity.aio import AzureCliCredential
 from dotenv import load_dotenv
 
-# Import helper modules
-from .gemini_api import call_gemini_deep_research, analyze_with_gemini
-from .file_utils import generate_filename, save_research_pdf, save_business_model_canvas_docx
-
 # Load environment variables
 load_dotenv()
 
+# Research prompt template location
+PROMPT_FILE = Path(__file__).parent.parent / "Prompts" / "DeepResearch.txt"
+_prompt_template: str | None = None
+
+
+async def _load_prompt_template() -> str:
+    """Read the Deep Research prompt template once (without blocking the loop) and reuse it."""
+    global _prompt_template
+    if _prompt_template is None:
+        async with aiofiles.open(PROMPT_FILE, "r", encoding="utf-8") as f:
+            _prompt_template = await f.read()
+    return _prompt_template
 
 
 @ai_function(
@@ -29,16 +41,15 @@ async def gemini_deep_research(
     company_url: Annotated[str, "The URL of the company's website."],
 ) -> str:
     """Perform deep research on a company using Gemini Deep Research API, then generate Business Model Canvas."""
+    # Import helper modules lazily so DevUI discovery doesn't pay for the Gemini SDK
+    from .gemini_api import call_gemini_deep_research, analyze_with_gemini
+    from .file_utils import generate_filename, save_research_pdf, save_business_model_canvas_docx
 
     # Load the research prompt template
-    prompts_dir = Path(__file__).parent.parent / "Prompts"
-    prompt_file = prompts_dir / "DeepResearch.txt"
-
     try:
-        with open(prompt_file, "r", encoding="utf-8") as f:
-            prompt_template = f.read()
+        prompt_template = await _load_prompt_template()
     except FileNotFoundError:
-        return f"Error: Could not find prompt file at {prompt_file}"
+        return f"Error: Could not find prompt file at {PROMPT_FILE}"
 
     # Replace placeholders with actual company information
     prompt = prompt_template.replace("[Company Name]", company_name)
@@ -50,61 +61,96 @@ async def gemini_deep_research(
     research_result = await call_gemini_deep_research(prompt)
 
     print(f"✅ Deep research completed!\n")
-    print(research_result)
 
-    # Prepare output directory
-    output_dir = Path(__file__).parent.parent / "deep_research"
-    output_dir.mkdir(exist_ok=True)
+    print(f"🧠 Generating Business Model Canvas from research...")
 
-    # Generate filenames
-    base_filename, timestamp = generate_filename(company_name)
-    bmc_filename, _ = generate_filename(company_name, suffix="_BusinessModelCanvas")
+    # Start the Business Model Canvas request now so it runs alongside the file setup and PDF
+    bmc_prompt = f"""Analyze this research on {company_name} and create a Business Model Canvas.
 
-    try:
-        print(f"💾 Saving research report as PDF...")
+{research_result}
 
-        # Save research as PDF
-        pdf_file = save_research_pdf(
-            output_dir, base_filename, company_name, company_url, research_result
-        )
+Create sections: Customer Segments, Value Propositions, Channels, Customer Relationships, Revenue Streams, Key Resources, Key Activities, Key Partnerships, Cost Structure.
 
-        print(f"✅ Report saved: {pdf_file.name}\n")
-        print(f"🧠 Generating Business Model Canvas from research...")
+**IMPORTANT: Format your response as clean HTML using semantic tags like <h2>, <h3>, <p>, <ul>, <li>, <strong>, etc. Do NOT use markdown. Do NOT include <!DOCTYPE> or <html> wrapper tags - just the content HTML.**"""
+    bmc_task = asyncio.create_task(analyze_with_gemini(bmc_prompt))
+    pdf_task = None
 
-        # Generate Business Model Canvas from the research text
-        bmc_prompt = f"""Analyze this research on {company_name} and create a Business Model Canvas.
+    try:
+        # Prepare output directory
+        output_dir = Path(__file__).parent.parent / "deep_research"
+        output_dir.mkdir(exist_ok=True)
 
-{research_result}
+        # Generate filenames, stamping both documents with the same time
+        now = datetime.now()
+        generated_at = now.strftime('%Y-%m-%d %H:%M:%S')
+        base_filename, _ = generate_filename(company_name, now=now)
+        bmc_filename, _ = generate_filename(company_name, suffix="_BusinessModelCanvas", now=now)
 
-Create sections: Customer Segments, Value Propositions, Channels, Customer Relationships, Revenue Streams, Key Resources, Key Activities, Key Partnerships, Cost Structure.
+        print(f"💾 Saving research report as PDF...")
 
-**IMPORTANT: Format your response as clean HTML using semantic tags like <h2>, <h3>, <p>, <ul>, <li>, <strong>, etc. Do NOT use markdown. Do NOT include <!DOCTYPE> or <html> wrapper tags - just the content HTML.**"""
+        # Render the PDF on a worker thread so it overlaps with the BMC Gemini call
+        pdf_task = asyncio.create_task(asyncio.to_thread(
+            save_research_pdf, output_dir, base_filename, company_name, company_url, research_result,
+            generated_at,
+        ))
 
-        bmc_result = await analyze_with_gemini(bmc_prompt)
+        bmc_result = await bmc_task
 
         print(f"✅ Business Model Canvas generated!\n")
         print(f"💾 Saving Business Model Canvas as Word document...")
 
-        # Save Business Model Canvas
-        docx_file = save_business_model_canvas_docx(
-            output_dir, bmc_filename, company_name, company_url, bmc_result
-        )
-
-        print(f"✅ Document saved: {docx_file.name}\n")
-        print(f"🎉 All done!\n")
-
-        return (
-            f"{research_result}\n\n"
-            f"---\n\n"
-            f"✅ Research: {pdf_file.name}\n"
-            f"✅ Business Model Canvas: {docx_file.name}"
+        # Save Business Model Canvas while the PDF finishes; collect each file's outcome
+        docx_task = asyncio.to_thread(
+            save_business_model_canvas_docx, output_dir, bmc_filename, company_name, company_url, bmc_result,
+            generated_at,
         )
+        pdf_result, docx_result = await asyncio.gather(pdf_task, docx_task, return_exceptions=True)
     except Exception as e:
         return (
             f"{research_result}\n\n"
             f"---\n\n"
             f"⚠️ Error saving files: {str(e)}"
         )
+    finally:
+        # Don't leave the BMC call or PDF render running if setup failed part-way
+        for task in (bmc_task, pdf_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    # Report each file separately so one failure doesn't hide the file that was written
+    file_lines = []
+    for label, result in (("Research", pdf_result), ("Business Model Canvas", docx_result)):
+        if isinstance(result, BaseException):
+            print(f"⚠️ Error saving {label}: {result}\n")
+            file_lines.append(f"⚠️ {label}: Error saving file: {result}")
+        else:
+            print(f"✅ Saved: {result.name}\n")
+            file_lines.append(f"✅ {label}: {result.name}")
+
+    if not any(isinstance(result, BaseException) for result in (pdf_result, docx_result)):
+        print(f"🎉 All done!\n")
+
+    return (
+        f"{research_result}\n\n"
+        f"---\n\n"
+        + "\n".join(file_lines)
+    )
+
+
+@lru_cache(maxsize=1)
+def get_chat_client() -> AzureAIAgentClient:
+    """Return the process-wide Azure AI agent client.
+
+    The client and its credential are built once and shared, so anything that
+    needs a chat client reuses the same token cache and HTTP transport.
+    """
+    return AzureAIAgentClient(
+        credential=AzureCliCredential(),
+        project_endpoint=os.environ["PROJECT_ENDPOINT"],
+        model_deployment_name=os.environ["MODEL_DEPLOYMENT_NAME"],
+        agent_name="research-assistant-2",
+        agent_description="A research assistant that performs deep research on companies using Gemini Deep Research",
+    )
 
 
 # Create and export the agent for DevUI discovery
@@ -142,13 +188,7 @@ agent = ChatAgent(
 
         "Remember: Without the tool, you know NOTHING about any company. Act accordingly."
     ),
-    chat_client=AzureAIAgentClient(
-        credential=AzureCliCredential(),
-        project_endpoint=os.environ["PROJECT_ENDPOINT"],
-        model_deployment_name=os.environ["MODEL_DEPLOYMENT_NAME"],
-        agent_name="research-assistant-2",
-        agent_description="A research assistant that performs deep research on companies using Gemini Deep Research",
-    ),
+    chat_client=get_chat_client(),
     tools=[gemini_deep_research],
     greeting="Hello! I am your research assistant. Which company would you like to research today?",
 )
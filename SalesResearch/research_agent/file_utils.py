@@ -2,30 +2,220 @@
 
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+import copy
+import io
+import logging
+import os
 import re
-from html.parser import HTMLParser
-
-
-def generate_filename(company_name: str, suffix: str = "") -> tuple[str, str]:
+from string import Template
+from html import escape
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Byte table mapping every ASCII character that isn't alphanumeric, '-' or '_' to '_'
+_SANITIZE_TABLE = bytes(
+    b if b < 128 and (chr(b).isalnum() or chr(b) in "-_") else ord("_")
+    for b in range(256)
+)
+
+# Fallback for non-ASCII names: any character that isn't a word char or hyphen
+_SANITIZE_RE = re.compile(r"[^\w-]")
+
+# Stylesheet for research PDFs, built once rather than on every save
+_PDF_STYLESHEET = """
+    @page {
+        size: letter;
+        margin: 0.75in;
+    }
+    body {
+        font-family: Arial, sans-serif;
+        line-height: 1.6;
+        color: #333;
+    }
+    h1 {
+        color: #2c3e50;
+        border-bottom: 3px solid #3498db;
+        padding-bottom: 10px;
+        text-align: center;
+        font-size: 24pt;
+    }
+    h2 {
+        color: #34495e;
+        border-bottom: 2px solid #95a5a6;
+        padding-bottom: 8px;
+        margin-top: 20pt;
+        font-size: 18pt;
+    }
+    h3 {
+        color: #7f8c8d;
+        margin-top: 15pt;
+        font-size: 14pt;
+    }
+    h4 {
+        color: #95a5a6;
+        margin-top: 12pt;
+        font-size: 12pt;
+    }
+    p {
+        margin: 10px 0;
+        text-align: justify;
+    }
+    ul, ol {
+        margin: 10px 0;
+        padding-left: 30px;
+    }
+    li {
+        margin: 5px 0;
+    }
+    strong {
+        color: #2c3e50;
+    }
+    .metadata {
+        color: #7f8c8d;
+        font-size: 10pt;
+        margin-bottom: 30px;
+        text-align: center;
+    }
+    table {
+        border-collapse: collapse;
+        width: 100%;
+        margin: 15px 0;
+        page-break-inside: avoid;
+    }
+    th {
+        background-color: #34495e;
+        color: white;
+        padding: 8px;
+        text-align: left;
+        font-weight: bold;
+    }
+    td {
+        border: 1px solid #ddd;
+        padding: 8px;
+        text-align: left;
+    }
+    tr:nth-child(even) {
+        background-color: #f2f2f2;
+    }
+    a {
+        color: #3498db;
+        word-wrap: break-word;
+    }
+"""
+
+# HTML shell for research PDFs; only the per-report fields are substituted on each save
+_PDF_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <style>
+""" + _PDF_STYLESHEET + """
+    </style>
+</head>
+<body>
+    <h1>Strategic Pursuit Plan: $company_name</h1>
+    <div class="metadata">
+        <p><strong>Company URL:</strong> $company_url</p>
+        <p><strong>Generated:</strong> $generated_at</p>
+    </div>
+    <hr>
+    $content
+</body>
+</html>
+""")
+
+
+def generate_filename(company_name: str, suffix: str = "",
+                      now: datetime | None = None) -> tuple[str, str]:
     """Generate timestamped filename and sanitized company name.
 
     Args:
         company_name: The company name to sanitize
         suffix: Optional suffix to add (e.g., "_BusinessModelCanvas")
+        now: Optional time to stamp the filename with (defaults to the current time)
 
     Returns:
         Tuple of (base_filename, timestamp)
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_company_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in company_name)
-    safe_company_name = safe_company_name.replace(' ', '_')
+    timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    if company_name.isascii():
+        safe_company_name = company_name.encode("ascii").translate(_SANITIZE_TABLE).decode("ascii")
+    else:
+        safe_company_name = _SANITIZE_RE.sub("_", company_name)
     base_filename = f"{timestamp}_{safe_company_name}{suffix}"
     return base_filename, timestamp
 
 
+def _render_pdf_xhtml2pdf(html: str) -> bytes:
+    """Render an HTML document to PDF bytes with xhtml2pdf."""
+    from xhtml2pdf import pisa
+
+    buffer = io.BytesIO()
+    pisa_status = pisa.CreatePDF(html, dest=buffer)
+
+    if pisa_status.err:
+        raise Exception(f"PDF generation failed with error code: {pisa_status.err}")
+
+    return buffer.getvalue()
+
+
+def _render_pdf_weasyprint(html: str) -> bytes:
+    """Render an HTML document to PDF bytes with WeasyPrint."""
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf()
+
+
+# PDF rendering backends, selected with the PDF_BACKEND environment variable
+_PDF_BACKENDS = {
+    "weasyprint": _render_pdf_weasyprint,
+    "xhtml2pdf": _render_pdf_xhtml2pdf,
+}
+_DEFAULT_PDF_BACKEND = "weasyprint"
+
+
+@lru_cache(maxsize=1)
+def _weasyprint_import_error() -> Exception | None:
+    """Try importing WeasyPrint once; return the failure, or None if it's usable."""
+    try:
+        import weasyprint  # noqa: F401
+    except (ImportError, OSError) as e:  # OSError: Pango system libraries missing (common on Windows)
+        return e
+    return None
+
+
+@lru_cache(maxsize=None)
+def _resolve_pdf_backend(requested: str | None) -> Callable[[str], bytes]:
+    """Return the PDF renderer for a PDF_BACKEND value (None when the variable is unset).
+
+    When PDF_BACKEND is left unset and WeasyPrint can't be loaded, falls back to
+    xhtml2pdf with a single warning; an explicit PDF_BACKEND=weasyprint raises instead.
+    """
+    backend = (requested or _DEFAULT_PDF_BACKEND).lower()
+    if backend not in _PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF_BACKEND '{backend}' (expected one of: {', '.join(_PDF_BACKENDS)})")
+
+    if backend == "weasyprint":
+        error = _weasyprint_import_error()
+        if error is not None:
+            if requested:
+                raise RuntimeError(f"PDF_BACKEND=weasyprint but WeasyPrint could not be loaded: {error}") from error
+            logger.warning("WeasyPrint unavailable (%s); rendering PDFs with xhtml2pdf instead", error)
+            return _render_pdf_xhtml2pdf
+
+    return _PDF_BACKENDS[backend]
+
+
 def save_research_pdf(output_dir: Path, base_filename: str, company_name: str,
-                     company_url: str, content: str) -> Path:
-    """Save research report as PDF using xhtml2pdf.
+                     company_url: str, content: str,
+                     generated_at: str | None = None) -> Path:
+    """Save research report as PDF.
+
+    Uses WeasyPrint by default (falling back to xhtml2pdf if it can't be loaded);
+    set PDF_BACKEND=xhtml2pdf to use xhtml2pdf explicitly.
 
     Args:
         output_dir: Directory to save the file
@@ -33,191 +223,140 @@ def save_research_pdf(output_dir: Path, base_filename: str, company_name: str,
         company_name: Company name for title
         company_url: Company URL for metadata
         content: Research content in HTML format
+        generated_at: Preformatted generation time (defaults to the current time)
 
     Returns:
         Path to the saved PDF file
     """
-    from xhtml2pdf import pisa
+    render_pdf = _resolve_pdf_backend(os.getenv("PDF_BACKEND"))
 
     pdf_file = output_dir / f"{base_filename}.pdf"
+    generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    # Company details come from the model/user, so escape them before embedding in markup
+    safe_name = escape(company_name, quote=False)
+    safe_url = escape(company_url, quote=False)
 
     # Create full HTML document with styling
-    full_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <style>
-            @page {{
-                size: letter;
-                margin: 0.75in;
-            }}
-            body {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-            }}
-            h1 {{
-                color: #2c3e50;
-                border-bottom: 3px solid #3498db;
-                padding-bottom: 10px;
-                text-align: center;
-                font-size: 24pt;
-            }}
-            h2 {{
-                color: #34495e;
-                border-bottom: 2px solid #95a5a6;
-                padding-bottom: 8px;
-                margin-top: 20pt;
-                font-size: 18pt;
-            }}
-            h3 {{
-                color: #7f8c8d;
-                margin-top: 15pt;
-                font-size: 14pt;
-            }}
-            h4 {{
-                color: #95a5a6;
-                margin-top: 12pt;
-                font-size: 12pt;
-            }}
-            p {{
-                margin: 10px 0;
-                text-align: justify;
-            }}
-            ul, ol {{
-                margin: 10px 0;
-                padding-left: 30px;
-            }}
-            li {{
-                margin: 5px 0;
-            }}
-            strong {{
-                color: #2c3e50;
-            }}
-            .metadata {{
-                color: #7f8c8d;
-                font-size: 10pt;
-                margin-bottom: 30px;
-                text-align: center;
-            }}
-            table {{
-                border-collapse: collapse;
-                width: 100%;
-                margin: 15px 0;
-                page-break-inside: avoid;
-            }}
-            th {{
-                background-color: #34495e;
-                color: white;
-                padding: 8px;
-                text-align: left;
-                font-weight: bold;
-            }}
-            td {{
-                border: 1px solid #ddd;
-                padding: 8px;
-                text-align: left;
-            }}
-            tr:nth-child(even) {{
-                background-color: #f2f2f2;
-            }}
-            a {{
-                color: #3498db;
-                word-wrap: break-word;
-            }}
-        </style>
-    </head>
-    <body>
-        <h1>Strategic Pursuit Plan: {company_name}</h1>
-        <div class="metadata">
-            <p><strong>Company URL:</strong> {company_url}</p>
-            <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-        <hr>
-        {content}
-    </body>
-    </html>
+    full_html = _PDF_TEMPLATE.substitute(
+        company_name=safe_name,
+        company_url=safe_url,
+        generated_at=generated_at,
+        content=content,
+    )
+
+    # Generate PDF from HTML into memory, then write it out in one go
+    pdf_file.write_bytes(render_pdf(full_html))
+
+    return pdf_file
+
+
+# Horizontal rule used under the DOCX metadata block
+_SEPARATOR = "_" * 80
+
+_HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+_LIST_TAGS = {'ul', 'ol'}
+_BOLD_TAGS = {'strong', 'b'}
+_ITALIC_TAGS = {'em', 'i'}
+_BLOCK_TAGS = _HEADING_TAGS | {'p', 'li'}
+
+
+def _add_text(paragraph, text, bold: bool, italic: bool):
+    """Add a text node to the paragraph as a run, skipping whitespace-only nodes."""
+    if not text or text.isspace():
+        return
+    run = paragraph.add_run(text)
+    if bold:
+        run.bold = True
+    if italic:
+        run.italic = True
+
+
+def _add_inline(paragraph, element, bold: bool, italic: bool, nested_blocks: list):
+    """Add an element's text and inline children to the paragraph as formatted runs.
+
+    Nested lists and headings can't live inside a Word paragraph, so they're collected
+    in nested_blocks for the caller to add after the paragraph.
     """
+    _add_text(paragraph, element.text, bold, italic)
+    for child in element:
+        tag = child.tag
+        if tag == 'br':
+            paragraph.add_run('\n')
+        elif tag in _LIST_TAGS or tag in _HEADING_TAGS:
+            nested_blocks.append(child)
+        elif isinstance(tag, str):  # Comments and processing instructions have non-string tags
+            _add_inline(paragraph, child, bold or tag in _BOLD_TAGS, italic or tag in _ITALIC_TAGS,
+                        nested_blocks)
+        _add_text(paragraph, child.tail, bold, italic)
+
+
+def _add_block(doc, element):
+    """Add a block-level HTML element (and everything under it) to the Word document."""
+    tag = element.tag
+    if not isinstance(tag, str):
+        return
+
+    if tag in _HEADING_TAGS:
+        heading_text = "".join(element.itertext()).strip()
+        if heading_text:
+            doc.add_heading(heading_text, level=int(tag[1]))
+    elif tag in _BLOCK_TAGS:
+        paragraph = doc.add_paragraph(style='List Bullet') if tag == 'li' else doc.add_paragraph()
+        nested_blocks = []
+        _add_inline(paragraph, element, False, False, nested_blocks)
+        for nested in nested_blocks:
+            _add_block(doc, nested)
+    else:
+        # Containers (ul, ol, div, section, ...): text directly inside them is dropped
+        for child in element:
+            _add_block(doc, child)
+
+
+def add_html_to_docx(doc, content: str):
+    """Convert HTML content to Word headings, paragraphs and bullets in one streaming pass.
+
+    Each top-level heading, paragraph or list item is added as soon as its end tag is
+    parsed and then discarded, so memory stays flat however long the content gets.
 
-    # Generate PDF from HTML
-    with open(pdf_file, "wb") as f:
-        pisa_status = pisa.CreatePDF(full_html, dest=f)
+    Args:
+        doc: python-docx Document to append to
+        content: HTML fragment (e.g. the Business Model Canvas from Gemini)
+    """
+    from lxml import etree
 
-    if pisa_status.err:
-        raise Exception(f"PDF generation failed with error code: {pisa_status.err}")
+    if not content or content.isspace():
+        return
 
-    return pdf_file
+    events = etree.iterparse(io.BytesIO(content.encode("utf-8")), events=("end",),
+                             html=True, encoding="utf-8")
+    for _, element in events:
+        if element.tag not in _BLOCK_TAGS:
+            continue
+        # Blocks nested inside another block are added along with their outermost block
+        if any(ancestor.tag in _BLOCK_TAGS for ancestor in element.iterancestors()):
+            continue
 
+        _add_block(doc, element)
 
-class HTMLToDocxParser(HTMLParser):
-    """Parse HTML and convert to Word document structure."""
-
-    def __init__(self, doc):
-        super().__init__()
-        self.doc = doc
-        self.current_paragraph = None
-        self.in_list = False
-        self.in_bold = False
-        self.in_italic = False
-        self.in_heading = False
-        self.heading_level = 0
-        self.heading_text = ""
-
-    def handle_starttag(self, tag, attrs):
-        if tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            self.in_heading = True
-            self.heading_level = int(tag[1])
-            self.heading_text = ""
-        elif tag == 'p':
-            self.current_paragraph = self.doc.add_paragraph()
-        elif tag in ['ul', 'ol']:
-            self.in_list = True
-        elif tag == 'li':
-            if not self.current_paragraph:
-                self.current_paragraph = self.doc.add_paragraph(style='List Bullet')
-        elif tag == 'strong' or tag == 'b':
-            self.in_bold = True
-        elif tag == 'em' or tag == 'i':
-            self.in_italic = True
-        elif tag == 'br':
-            if self.current_paragraph:
-                self.current_paragraph.add_run('\n')
-
-    def handle_endtag(self, tag):
-        if tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            if self.heading_text.strip():
-                self.doc.add_heading(self.heading_text.strip(), level=self.heading_level)
-            self.in_heading = False
-            self.heading_text = ""
-        elif tag == 'p':
-            self.current_paragraph = None
-        elif tag in ['ul', 'ol']:
-            self.in_list = False
-        elif tag == 'li':
-            self.current_paragraph = None
-        elif tag == 'strong' or tag == 'b':
-            self.in_bold = False
-        elif tag == 'em' or tag == 'i':
-            self.in_italic = False
-
-    def handle_data(self, data):
-        if not data.strip():
-            return
-
-        if self.in_heading:
-            self.heading_text += data
-        elif self.current_paragraph:
-            run = self.current_paragraph.add_run(data)
-            if self.in_bold:
-                run.bold = True
-            if self.in_italic:
-                run.italic = True
+        # Drop the finished block and any siblings before it; they've all been processed
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+@lru_cache(maxsize=1)
+def _blank_docx():
+    """Load python-docx's default template once; callers must deepcopy the result."""
+    from docx import Document
+
+    return Document()
 
 
 def save_business_model_canvas_docx(output_dir: Path, base_filename: str,
                                    company_name: str, company_url: str,
-                                   content: str) -> Path:
+                                   content: str,
+                                   generated_at: str | None = None) -> Path:
     """Save Business Model Canvas as Word document from HTML content.
 
     Args:
@@ -226,15 +365,15 @@ def save_business_model_canvas_docx(output_dir: Path, base_filename: str,
         company_name: Company name for title
         company_url: Company URL for metadata
         content: Business Model Canvas HTML content
+        generated_at: Preformatted generation time (defaults to the current time)
 
     Returns:
         Path to the saved DOCX file
     """
-    from docx import Document
     from docx.enum.text import WD_ALIGN_PARAGRAPH
 
     docx_file = output_dir / f"{base_filename}.docx"
-    doc = Document()
+    doc = copy.deepcopy(_blank_docx())
 
     # Title
     title = doc.add_heading(f"Business Model Canvas: {company_name}", 0)
@@ -247,15 +386,16 @@ def save_business_model_canvas_docx(output_dir: Path, base_filename: str,
 
     timestamp_para = doc.add_paragraph()
     timestamp_para.add_run(f"Generated: ").bold = True
-    timestamp_para.add_run(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    timestamp_para.add_run(generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
     doc.add_paragraph()  # Empty line
-    doc.add_paragraph("_" * 80)  # Separator
+    doc.add_paragraph(_SEPARATOR)
     doc.add_paragraph()
 
     # Parse HTML content and add to document
-    parser = HTMLToDocxParser(doc)
-    parser.feed(content)
+    add_html_to_docx(doc, content)
 
-    doc.save(str(docx_file))
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    docx_file.write_bytes(buffer.getvalue())
     return docx_file
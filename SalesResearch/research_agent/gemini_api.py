@@ -2,33 +2,126 @@
 
 import os
 import asyncio
+import functools
+import hashlib
+import logging
+import random
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+import aiofiles
 from dotenv import load_dotenv
-from google import genai
-from google.genai.types import GenerateContentConfig
 
-load_dotenv()
+if TYPE_CHECKING:
+    from google import genai
+
+logger = logging.getLogger(__name__)
 
 # Gemini API configuration
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
 GEMINI_AGENT = "deep-research-pro-preview-12-2025"
 # Use Gemini 2.0 Flash for reasoning tasks
 GEMINI_REASONING_MODEL = "gemini-2.0-flash-exp"
 
-# Initialize Gemini client
-client = genai.Client(api_key=GEMINI_API_KEY)
+# Polling for the final report: exponential backoff (with jitter) within a fixed time budget
+POLL_INITIAL_DELAY = 2.0  # seconds
+POLL_MAX_DELAY = 30.0  # seconds
+POLL_BACKOFF_FACTOR = 1.5
+POLL_TIMEOUT = 33 * 60  # seconds
+
+# Default lifetime of cached Deep Research reports (override with GEMINI_CACHE_TTL)
+CACHE_TTL_DEFAULT = 7 * 24 * 60 * 60  # seconds
+
+
+@functools.cache
+def _load_env() -> None:
+    """Load .env once, on first use rather than at import."""
+    load_dotenv()
+
+
+@functools.cache
+def _client() -> "genai.Client | None":
+    """Return the shared Gemini client, or None if GEMINI_API_KEY isn't configured."""
+    _load_env()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        return None
+
+    from google import genai
+
+    return genai.Client(api_key=api_key)
+
+
+@functools.cache
+def _cache_settings() -> tuple[Path, int]:
+    """Return (cache directory, TTL in seconds) for completed Deep Research reports.
+
+    GEMINI_CACHE_TTL=0 disables the cache.
+    """
+    _load_env()
+    cache_dir = Path(os.getenv("GEMINI_CACHE_DIR", "~/.cache/sales_research")).expanduser()
+    raw_ttl = os.getenv("GEMINI_CACHE_TTL")
+    try:
+        cache_ttl = int(raw_ttl) if raw_ttl is not None else CACHE_TTL_DEFAULT
+    except ValueError:
+        logger.warning("Ignoring invalid GEMINI_CACHE_TTL=%r (expected whole seconds); using %d",
+                       raw_ttl, CACHE_TTL_DEFAULT)
+        cache_ttl = CACHE_TTL_DEFAULT
+    return cache_dir, cache_ttl
+
+
+def _cache_path(prompt: str) -> Path:
+    """Cache file for a Deep Research prompt, keyed by agent and prompt text."""
+    key = hashlib.sha256(f"{GEMINI_AGENT}|{prompt}".encode("utf-8")).hexdigest()
+    cache_dir, _ = _cache_settings()
+    return cache_dir / f"{key}.txt"
+
+
+async def _read_cached_report(path: Path) -> str | None:
+    """Return a cached report if one exists and hasn't expired."""
+    _, cache_ttl = _cache_settings()
+    if cache_ttl <= 0:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime > cache_ttl:
+            return None
+        async with aiofiles.open(path, "r", encoding="utf-8") as f:
+            return await f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+async def _write_cached_report(path: Path, report: str) -> None:
+    """Atomically store a completed report; caching is best-effort."""
+    _, cache_ttl = _cache_settings()
+    if cache_ttl <= 0:
+        return
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+            await f.write(report)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not cache research report: {e}\n")
 
 
 async def call_gemini_deep_research(prompt: str) -> str:
-    """Call Gemini Deep Research API with streaming."""
-    if not GEMINI_API_KEY:
+    """Call Gemini Deep Research API with streaming, reusing cached reports for repeated prompts."""
+    client = _client()
+    if client is None:
         return "Error: GEMINI_API_KEY not set in environment variables"
 
     try:
+        cache_path = _cache_path(prompt)
+        cached_report = await _read_cached_report(cache_path)
+        if cached_report is not None:
+            print(f"♻️ Using cached research report ({cache_path.name})\n")
+            return cached_report
+
         print(f"⏳ Deep Research starting...\n")
 
-        # Start streaming research
-        stream = client.interactions.create(
+        # Start streaming research (async client, so the loop stays free while we wait)
+        stream = await client.aio.interactions.create(
             input=prompt,
             agent=GEMINI_AGENT,
             background=True,
@@ -42,18 +135,19 @@ async def call_gemini_deep_research(prompt: str) -> str:
         interaction_id = None
 
         # Stream thought summaries only
-        for chunk in stream:
-            if chunk.event_type == "interaction.start":
-                interaction_id = chunk.interaction.id
-                print(f"📋 Interaction ID: {interaction_id}\n")
+        async with stream:
+            async for chunk in stream:
+                if chunk.event_type == "interaction.start":
+                    interaction_id = chunk.interaction.id
+                    print(f"📋 Interaction ID: {interaction_id}\n")
 
-            elif chunk.event_type == "content.delta":
-                if hasattr(chunk.delta, 'type') and chunk.delta.type == "thought_summary":
-                    print(f"\n💭 {chunk.delta.content.text}\n", flush=True)
+                elif chunk.event_type == "content.delta":
+                    if hasattr(chunk.delta, 'type') and chunk.delta.type == "thought_summary":
+                        print(f"\n💭 {chunk.delta.content.text}\n", flush=True)
 
-            elif chunk.event_type == "interaction.complete":
-                print(f"\n✅ Research completed!\n")
-                break
+                elif chunk.event_type == "interaction.complete":
+                    print(f"\n✅ Research completed!\n")
+                    break
 
         # Poll for final report
         if not interaction_id:
@@ -61,18 +155,18 @@ async def call_gemini_deep_research(prompt: str) -> str:
 
         print(f"📥 Fetching final research report...\n")
 
-        max_retries = 100  # 100 retries x 20 seconds = ~33 minutes
-        retry_count = 0
+        deadline = time.monotonic() + POLL_TIMEOUT
+        delay = POLL_INITIAL_DELAY
 
-        while retry_count < max_retries:
-            interaction = client.interactions.get(id=interaction_id)
+        while time.monotonic() < deadline:
+            interaction = await client.aio.interactions.get(id=interaction_id)
 
             if interaction.status == "completed":
                 if hasattr(interaction, 'outputs') and interaction.outputs and len(interaction.outputs) > 0:
                     final_report = interaction.outputs[-1].text
-                    print(f"\n{'='*80}\nRESEARCH REPORT ({len(final_report)} characters):\n{'='*80}\n")
-                    print(final_report)
-                    print(f"\n{'='*80}\n")
+                    print(f"📄 Research report received ({len(final_report)} characters)\n")
+                    logger.debug("Research report for %s:\n%s", interaction_id, final_report)
+                    await _write_cached_report(cache_path, final_report)
                     return final_report
                 else:
                     return f"No outputs in completed interaction {interaction_id}"
@@ -83,21 +177,22 @@ async def call_gemini_deep_research(prompt: str) -> str:
 
             # Still processing
             print(f"⏳ Status: {interaction.status}, waiting...\n")
-            await asyncio.sleep(20)
-            retry_count += 1
+            await asyncio.sleep(delay * random.uniform(0.9, 1.1))
+            delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
 
-        return f"Timeout after 33 minutes waiting for {interaction_id}"
+        return f"Timeout after {POLL_TIMEOUT // 60} minutes waiting for {interaction_id}"
     except Exception as e:
         return f"Error calling Gemini Deep Research: {str(e)}"
 
 
 async def analyze_with_gemini(prompt: str) -> str:
     """Simple Gemini API call for analysis using SDK."""
-    if not GEMINI_API_KEY:
+    client = _client()
+    if client is None:
         return "Error: GEMINI_API_KEY not set"
 
     try:
-        response = client.models.generate_content(
+        response = await client.aio.models.generate_content(
             model=GEMINI_REASONING_MODEL,
             contents=prompt
         )